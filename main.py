@@ -3,10 +3,16 @@ import re
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import requests
-from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
-import pickle
+import functools
+import sqlite3
+import time
+import types
+from typing import Dict, Optional, Tuple
 
 try:
     from dotenv import load_dotenv
@@ -15,6 +21,173 @@ except ImportError:
     DOTENV_AVAILABLE = False
     print("[DEBUG] python-dotenv not installed. Install with: pip install python-dotenv")
 
+# Cached TMDB searches older than this are served stale and refreshed in the background
+TMDB_CACHE_TTL = 7 * 24 * 60 * 60
+# Searches with no results are remembered for a day before TMDB is asked again
+TMDB_NEGATIVE_TTL = 24 * 60 * 60
+
+# Filename cleanup patterns, compiled once at import
+_YEAR_RE = re.compile(r'\((?P<paren>\d{4})\)|(?<=[._\s-])(?P<bare>(?:19|20)\d{2})(?![^._\s-])')
+# (YYYY), [brackets], {braces} and release tags that contain a separator, removed in one pass
+_STRIP_RE = re.compile(
+    r'\(\d{4}\)'
+    r'|[\[\{].*?[\]\}]'
+    r'|(?<![a-z0-9])(?:[hx]\.26[45]|dts-hd|web-(?:dl|rip)|blu-ray|x86_64)(?![a-z0-9])',
+    re.IGNORECASE
+)
+# Dots/dashes/underscores become spaces so str.split() can tokenize
+_SEP_TABLE = str.maketrans('._-', '   ')
+_INT_RE = re.compile(r'\b\d+\b')
+_DIGITS_DEL = str.maketrans('', '', '0123456789')
+
+# Roman numeral digits for each decimal place, indexed by digit value
+_ROMAN_THOUSANDS = ('', 'M', 'MM', 'MMM')
+_ROMAN_HUNDREDS = ('', 'C', 'CC', 'CCC', 'CD', 'D', 'DC', 'DCC', 'DCCC', 'CM')
+_ROMAN_TENS = ('', 'X', 'XX', 'XXX', 'XL', 'L', 'LX', 'LXX', 'LXXX', 'XC')
+_ROMAN_ONES = ('', 'I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX')
+
+# Characters not allowed in file/folder names
+_SANITIZE_TABLE = str.maketrans('', '', '<>:"/\\|?*')
+
+_ROMAN_MAP = {
+    'IV': '4', 'IX': '9', 'XL': '40', 'XC': '90', 'CD': '400', 'CM': '900',
+    'I': '1', 'V': '5', 'X': '10', 'L': '50', 'C': '100', 'D': '500', 'M': '1000'
+}
+# Longer numerals first so the alternation never takes a partial match
+_ROMAN_RE = re.compile(r'\b(' + '|'.join(sorted(_ROMAN_MAP, key=len, reverse=True)) + r')\b', re.IGNORECASE)
+
+# Quality markers and common release tags, matched per token (lowercase)
+_JUNK_TOKENS = frozenset({
+    '1080p', '720p', '480p', '2160p', '4k', 'uhd', 'ultrahd', 'bluray', 'bdrip', 'webrip', 'hdtv', 'dvdrip',
+    'h264', 'x264', 'hevc', 'h265', 'x265', 'aac', 'ac3', 'dts', 'amd64', '10bit', 'avc', 'vc1', 'mpeg2',
+    'aiff', 'flac', 'opus', 'vorbis', 'mp3', 'eac3', 'truehd', 'atmos', 'imax', 'remastered', 'extended',
+    'directorcut', 'directorscut', 'uncut', 'proper', 'rerip', 'remux', 'pdtv', 'dsr', 'ts', 'tc', 'r5',
+    'dvdscr', 'brrip', 'xvid', 'divx', 'web', 'webdl',
+})
+# Usernames/release groups - only stripped after the first token
+_GROUP_TOKENS = frozenset({'rarbg', 'anoxmous', 'scene'})
+
+# TMDB allows roughly 40 requests per 10 seconds
+TMDB_RATE = 4.0
+TMDB_BURST = 40
+# Lookup workers and the cap on requests in flight to TMDB (the token bucket enforces the rate)
+LOOKUP_WORKERS = 8
+TMDB_MAX_CONCURRENT = 8
+
+# Divider shown above each preview item
+_SEP_LINE = "=" * 80
+
+_VIDEO_EXTS = ('.mp4', '.mkv', '.avi', '.mov', '.flv')
+_VIDEO_FILETYPES = " ".join(f"*{ext}" for ext in _VIDEO_EXTS)  # Pattern for the file dialog
+
+
+def _iter_videos(root):
+    """Yield video file paths under root using a single scandir walk"""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.lower().endswith(_VIDEO_EXTS):
+                        yield entry.path
+        except OSError as e:
+            print(f"[DEBUG] Skipping unreadable folder: {e}")
+
+
+def parse_filename(name: str) -> Tuple[str, Optional[str]]:
+    """Strip release junk from a filename (without extension), returning (clean_name, year)"""
+    # One scan for years: a (YYYY) wins, otherwise the last separator-bounded year.
+    # A year at the very start is never the release year (2001.A.Space.Odyssey, 1917.2019)
+    year_match = None
+    for match in _YEAR_RE.finditer(name):
+        year_match = match
+        if match.group('paren'):
+            break
+    year = None
+    if year_match:
+        year = year_match.group('paren') or year_match.group('bare')
+        name = name[:year_match.start()] + ' ' + name[year_match.end():]
+
+    # Drop (YYYY), [brackets], {braces} and dotted/dashed tags before tokenizing
+    clean_name = _STRIP_RE.sub(' ', name)
+
+    # Split on dots/dashes/underscores/spaces and drop quality markers and release groups (other years stay in the title)
+    tokens = []
+    for token in clean_name.translate(_SEP_TABLE).split():
+        lower = token.lower()
+        if lower in _JUNK_TOKENS:
+            continue
+        if tokens and lower in _GROUP_TOKENS:
+            continue
+        tokens.append(token)
+
+    clean_name = ' '.join(tokens)
+    return clean_name, year
+
+
+def _number_to_roman(num):
+    """Convert number to Roman numeral"""
+    thousands = _ROMAN_THOUSANDS[num // 1000] if num < 4000 else 'M' * (num // 1000)
+    return thousands + _ROMAN_HUNDREDS[num % 1000 // 100] + _ROMAN_TENS[num % 100 // 10] + _ROMAN_ONES[num % 10]
+
+
+def build_query_params(query: str, year: Optional[str] = None) -> Dict[str, object]:
+    """Build TMDB /search/movie params (api_key and language ride on the session)"""
+    params: Dict[str, object] = {
+        'query': query,
+        'page': 1
+    }
+    if year:
+        params['year'] = year
+    return params
+
+
+def movie_from_result(result: Dict[str, object]) -> Dict[str, object]:
+    """Reduce a TMDB search result to the title/year/id dict used for naming"""
+    release_date = result.get('release_date')
+    return {
+        'title': result['title'],
+        'year': release_date[:4] if release_date else 'UNKNOWN',
+        'id': result['id'],
+    }
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting the average request rate"""
+
+    def __init__(self, rate=TMDB_RATE, capacity=TMDB_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        """Block until a token is available"""
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                wait = self.blocked_until - now
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+                self.condition.wait(wait)
+
+    def pause(self, seconds):
+        """Hold back every caller for the given time (e.g. after a 429)"""
+        with self.condition:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
 class MovieRenamer:
     def __init__(self, root, api_key):
         self.root = root
@@ -23,58 +196,219 @@ class MovieRenamer:
         self.api_key = api_key
         self.tmdb_base = "https://api.themoviedb.org/3"
         self.preview_data = []
+        self.found_count = 0  # preview_data entries with status "found"
+        self.line_to_movie_index = []  # preview_data index for each listbox line (None for info lines)
+        self.preview_cache = {}  # (filepath, language) -> TMDB match from an earlier scan (reset by Clear)
 
-        # Load configurations
-        self.config_file = os.path.join(os.path.expanduser("~"), ".movie_renamer_config")
+        # Load configurations (every saved setting lives in one JSON file)
         self.settings_file = os.path.join(os.path.expanduser("~"), ".movie_renamer_settings.json")
-        self.window_state_file = os.path.join(os.path.expanduser("~"), ".movie_renamer_window")
+        self.cache_file = os.path.join(os.path.expanduser("~"), ".movie_renamer_cache.sqlite")
+        self.config = self.load_config()
+        self.config_save_job = None
 
         self.last_folder = self.load_last_folder()
 
         # Processing state
         self.processing = False
+        self.preview_pending = []  # Lookup results waiting to be shown
+        self.preview_lock = threading.Lock()
+        self.preview_flush_scheduled = False
+        self.last_ui_update = 0.0  # Throttles status updates from the rename thread
 
         # Settings
         self.dark_mode = tk.BooleanVar(value=True)
         self.language = tk.StringVar(value="en")
         self.naming_pattern = tk.StringVar(value="{title} ({year})")
+        self.window_state = None  # Saved geometry, stored alongside the settings
+        self.requery_negatives = tk.BooleanVar(value=False)
 
         self.load_settings()
         self.setup_theme()
 
-        # TMDB cache for faster processing
+        # Shared HTTP session - keeps the TMDB connection alive between requests
+        self.session = self.create_session()
+        self.search_get = functools.partial(self.session.get, f"{self.tmdb_base}/search/movie", timeout=10)
+        self.request_slots = threading.Semaphore(TMDB_MAX_CONCURRENT)
+        self.rate_limiter = TokenBucket()
+        self.language.trace_add("write", lambda *args: self.update_session_params())
+
+        # TMDB cache for faster processing (in-memory L1 in front of SQLite)
         self.tmdb_cache = {}
+        self.setup_cache()
 
         # Build UI
+        self.tooltip = None  # Shared tooltip window, created on first hover
         self.setup_ui()
         self.load_window_state()
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
+    def create_session(self):
+        """Create pooled HTTP session with retry/backoff for TMDB"""
+        session = requests.Session()
+        # raise_on_status=False hands a final 429 back to us so Retry-After can pause the rate limiter
+        retry = Retry(total=5, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+        session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=LOOKUP_WORKERS, max_retries=retry))
+        session.params = {'api_key': self.api_key, 'language': self.language.get()}
+        return session
+
+    def update_session_params(self):
+        """Refresh default TMDB params after API key or language change"""
+        self.session.params = {'api_key': self.api_key, 'language': self.language.get()}
+
+    def setup_cache(self):
+        """Open persistent TMDB search cache"""
+        self.cache_lock = threading.Lock()
+        self.cache_refreshing = set()
+        self.cache_stats = {'memory': 0, 'disk': 0, 'negative': 0, 'network': 0}
+
+        # Mirror the Tk setting into a plain attribute so worker threads can read it
+        self.skip_negative_cache = self.requery_negatives.get()
+        self.requery_negatives.trace_add("write", lambda *args: setattr(self, 'skip_negative_cache', self.requery_negatives.get()))
+
+        try:
+            self.cache_db = sqlite3.connect(self.cache_file, check_same_thread=False)
+            self.cache_db.execute("PRAGMA journal_mode=WAL")
+            self.cache_db.execute("PRAGMA synchronous=NORMAL")
+            self.cache_db.execute(
+                "CREATE TABLE IF NOT EXISTS tmdb_cache ("
+                "query TEXT, year TEXT, lang TEXT, payload BLOB, fetched_at INT, "
+                "PRIMARY KEY (query, year, lang))"
+            )
+            # Expired misses are re-queried anyway; drop them so the file doesn't grow forever
+            self.cache_db.execute(
+                "DELETE FROM tmdb_cache WHERE payload IS NULL AND fetched_at < ?",
+                (int(time.time()) - TMDB_NEGATIVE_TTL,)
+            )
+            self.cache_db.commit()
+        except sqlite3.Error as e:
+            print(f"[DEBUG] TMDB cache disabled: {e}")
+            self.cache_db = None
+
+    def _tmdb_search(self, query, year=None):
+        """Search TMDB movies, served from memory/SQLite cache when possible
+
+        Returns the search response, or None when TMDB has no results.
+        """
+        key = (query, year or '', self.session.params['language'])
+
+        if key in self.tmdb_cache:
+            data = self.tmdb_cache[key]
+            if data is not None:
+                self._count_cache('memory')
+                return data
+            if not self.skip_negative_cache:
+                self._count_cache('negative')
+                return None
+
+        row = None
+        if self.cache_db is not None:
+            with self.cache_lock:
+                row = self.cache_db.execute(
+                    "SELECT payload, fetched_at FROM tmdb_cache WHERE query=? AND year=? AND lang=?", key
+                ).fetchone()
+
+        if row is None:
+            return self._fetch_tmdb_search(key)
+
+        payload, fetched_at = row
+        if payload is None:
+            if self.skip_negative_cache or time.time() - fetched_at > TMDB_NEGATIVE_TTL:
+                return self._fetch_tmdb_search(key)
+            self._count_cache('negative')
+            self.tmdb_cache[key] = None
+            return None
+
+        self._count_cache('disk')
+        data = json.loads(payload)
+        self.tmdb_cache[key] = data
+
+        # Stale-while-revalidate: serve the old payload, refresh it in the background
+        if time.time() - fetched_at > TMDB_CACHE_TTL:
+            with self.cache_lock:
+                needs_refresh = key not in self.cache_refreshing
+                self.cache_refreshing.add(key)
+            if needs_refresh:
+                threading.Thread(target=self._refresh_tmdb_search, args=(key,), daemon=True).start()
+
+        return data
+
+    def _fetch_tmdb_search(self, key):
+        """Query TMDB directly and store the response in the cache"""
+        query, year, _ = key
+        params = build_query_params(query, year)
+
+        self._count_cache('network')
+        with self.request_slots:
+            self.rate_limiter.acquire()
+            response = self.search_get(params=params)
+
+        if response.status_code == 429:
+            retry_after = response.headers.get('Retry-After', '')
+            wait = int(retry_after) if retry_after.isdigit() else 10
+            print(f"[DEBUG] TMDB rate limit hit, pausing requests for {wait}s")
+            self.rate_limiter.pause(wait)
+
+        if response.status_code == 404:
+            data = None
+        else:
+            response.raise_for_status()
+            data = response.json()
+            if not data['results']:
+                data = None
+
+        # Misses are stored with a NULL payload
+        self.tmdb_cache[key] = data
+        if self.cache_db is not None:
+            with self.cache_lock:
+                self.cache_db.execute(
+                    "INSERT OR REPLACE INTO tmdb_cache (query, year, lang, payload, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                    key + (json.dumps(data) if data is not None else None, int(time.time()))
+                )
+                self.cache_db.commit()
+        return data
+
+    def _count_cache(self, kind):
+        """Track cache hits/misses for debugging the hit ratio"""
+        with self.cache_lock:
+            self.cache_stats[kind] += 1
+
+    def _refresh_tmdb_search(self, key):
+        """Background refresh of a stale cache entry"""
+        try:
+            self._fetch_tmdb_search(key)
+            print(f"[DEBUG] Refreshed stale TMDB cache entry: {key[0]}")
+        except Exception as e:
+            print(f"[DEBUG] Error refreshing TMDB cache for '{key[0]}': {e}")
+        finally:
+            with self.cache_lock:
+                self.cache_refreshing.discard(key)
+
     def setup_theme(self):
         """Setup dark/light theme"""
-        # Dark theme colors
-        self.dark_bg = "#1e1e1e"
-        self.dark_fg = "#ffffff"
-        self.dark_listbox_bg = "#2d2d2d"
-        self.dark_button_bg = "#0d47a1"
-        self.dark_button_fg = "#ffffff"
-        self.dark_entry_bg = "#3d3d3d"
-        self.dark_entry_fg = "#ffffff"
+        # Dark theme colors (read-only, built once and shared by get_colors)
+        self.dark_colors = types.MappingProxyType({
+            'bg': "#1e1e1e",
+            'fg': "#ffffff",
+            'listbox_bg': "#2d2d2d",
+            'button_bg': "#0d47a1",
+            'button_fg': "#ffffff",
+            'entry_bg': "#3d3d3d",
+            'entry_fg': "#ffffff"
+        })
 
         # Light theme colors
-        self.light_bg = "#f0f0f0"
-        self.light_fg = "#000000"
-        self.light_listbox_bg = "#ffffff"
-        self.light_button_bg = "#0d47a1"
-        self.light_button_fg = "#ffffff"
-        self.light_entry_bg = "#ffffff"
-        self.light_entry_fg = "#000000"
+        self.light_colors = types.MappingProxyType({
+            'bg': "#f0f0f0",
+            'fg': "#000000",
+            'listbox_bg': "#ffffff",
+            'button_bg': "#0d47a1",
+            'button_fg': "#ffffff",
+            'entry_bg': "#ffffff",
+            'entry_fg': "#000000"
+        })
 
         # Setup ttk styles for scrollbar and other widgets
         self.setup_styles()
-
-        # Load theme preference
-        self.load_theme_preference()
         self.apply_theme()
 
     def setup_styles(self):
@@ -102,25 +436,6 @@ class MovieRenamer:
             arrowcolor="#000000"
         )
 
-    def load_theme_preference(self):
-        """Load saved theme preference"""
-        try:
-            theme_file = os.path.join(os.path.expanduser("~"), ".movie_renamer_theme")
-            if os.path.exists(theme_file):
-                with open(theme_file, 'r') as f:
-                    self.dark_mode.set(f.read().strip() == "dark")
-        except:
-            self.dark_mode.set(True)
-
-    def save_theme_preference(self):
-        """Save theme preference"""
-        try:
-            theme_file = os.path.join(os.path.expanduser("~"), ".movie_renamer_theme")
-            with open(theme_file, 'w') as f:
-                f.write("dark" if self.dark_mode.get() else "light")
-        except:
-            pass
-
     def apply_status_color(self):
         """Apply accessible status text color based on theme"""
         if not hasattr(self, 'status_label'):
@@ -135,35 +450,14 @@ class MovieRenamer:
 
     def apply_theme(self):
         """Apply theme colors"""
-        if self.dark_mode.get():
-            self.root.configure(bg=self.dark_bg)
-        else:
-            self.root.configure(bg=self.light_bg)
+        self.root.configure(bg=self.get_colors()['bg'])
         self.apply_status_color()
-        self.save_theme_preference()
+        if self.config.get('dark_mode') != self.dark_mode.get():
+            self.schedule_config_save()
 
     def get_colors(self):
         """Get current theme colors"""
-        if self.dark_mode.get():
-            return {
-                'bg': self.dark_bg,
-                'fg': self.dark_fg,
-                'listbox_bg': self.dark_listbox_bg,
-                'button_bg': self.dark_button_bg,
-                'button_fg': self.dark_button_fg,
-                'entry_bg': self.dark_entry_bg,
-                'entry_fg': self.dark_entry_fg
-            }
-        else:
-            return {
-                'bg': self.light_bg,
-                'fg': self.light_fg,
-                'listbox_bg': self.light_listbox_bg,
-                'button_bg': self.light_button_bg,
-                'button_fg': self.light_button_fg,
-                'entry_bg': self.light_entry_bg,
-                'entry_fg': self.light_entry_fg
-            }
+        return self.dark_colors if self.dark_mode.get() else self.light_colors
 
     def setup_drag_drop(self):
         """Setup drag and drop support"""
@@ -221,27 +515,20 @@ class MovieRenamer:
                     clean_files.append(f)
                     print(f"[DEBUG] Path exists: {f}")
 
-            # Handle both files and folders
+            # Handle both files and folders (folders are scanned in the background thread)
             video_files = []
+            folders = []
             for f in clean_files:
-                if os.path.isfile(f) and f.lower().endswith(('.mp4', '.mkv', '.avi', '.mov', '.flv')):
+                if os.path.isfile(f) and f.lower().endswith(_VIDEO_EXTS):
                     video_files.append(f)
                     print(f"[DEBUG] Added video file: {f}")
                 elif os.path.isdir(f):
-                    # Recursively find video files in dropped folder
-                    print(f"[DEBUG] Scanning folder for videos: {f}")
-                    for ext in ('mp4', 'mkv', 'avi', 'mov', 'flv'):
-                        found = list(Path(f).glob(f'**/*.{ext}'))
-                        found.extend(list(Path(f).glob(f'**/*.{ext.upper()}')))
-                        for vf in found:
-                            video_files.append(str(vf))
-                            print(f"[DEBUG] Found video: {vf}")
-
-            video_files = list(set(video_files))  # Remove duplicates
-
-            if video_files:
-                print(f"[DEBUG] Processing {len(video_files)} video file(s)")
-                self.process_files(video_files)
+                    folders.append(f)
+                    print(f"[DEBUG] Queued folder for scanning: {f}")
+
+            if video_files or folders:
+                print(f"[DEBUG] Processing {len(video_files)} video file(s) and {len(folders)} folder(s)")
+                self.process_files(video_files, folders)
             else:
                 print("[DEBUG] No video files found in dropped items")
                 messagebox.showwarning("No Videos", "No video files found in dropped folder")
@@ -350,17 +637,19 @@ class MovieRenamer:
     def create_tooltip(self, widget, text):
         """Create tooltip for widget"""
         def on_enter(event):
-            tooltip = tk.Toplevel()
-            tooltip.wm_overrideredirect(True)
-            tooltip.wm_geometry(f"+{event.x_root+10}+{event.y_root+10}")
-            label = tk.Label(tooltip, text=text, background="lightyellow", relief=tk.SOLID, borderwidth=1, font=("Arial", 9))
-            label.pack()
-            widget.tooltip = tooltip
+            if self.tooltip is None:
+                self.tooltip = tk.Toplevel(self.root)
+                self.tooltip.withdraw()
+                self.tooltip.wm_overrideredirect(True)
+                self.tooltip_label = tk.Label(self.tooltip, background="lightyellow", relief=tk.SOLID, borderwidth=1, font=("Arial", 9))
+                self.tooltip_label.pack()
+            self.tooltip_label.config(text=text)
+            self.tooltip.wm_geometry(f"+{event.x_root+10}+{event.y_root+10}")
+            self.tooltip.deiconify()
 
         def on_leave(event):
-            if hasattr(widget, 'tooltip'):
-                widget.tooltip.destroy()
-                del widget.tooltip
+            if self.tooltip is not None:
+                self.tooltip.withdraw()
 
         widget.bind('<Enter>', on_enter)
         widget.bind('<Leave>', on_leave)
@@ -368,24 +657,22 @@ class MovieRenamer:
     def load_window_state(self):
         """Load saved window position and size"""
         try:
-            if os.path.exists(self.window_state_file):
-                with open(self.window_state_file, 'rb') as f:
-                    state = pickle.load(f)
-                    self.root.geometry(f"{state['width']}x{state['height']}+{state['x']}+{state['y']}")
+            if self.window_state:
+                state = self.window_state
+                self.root.geometry(f"{int(state['width'])}x{int(state['height'])}+{int(state['x'])}+{int(state['y'])}")
         except:
             pass
 
     def save_window_state(self):
         """Save window position and size"""
         try:
-            state = {
+            self.window_state = {
                 'width': self.root.winfo_width(),
                 'height': self.root.winfo_height(),
                 'x': self.root.winfo_x(),
                 'y': self.root.winfo_y()
             }
-            with open(self.window_state_file, 'wb') as f:
-                pickle.dump(state, f)
+            self.save_config()
         except:
             pass
 
@@ -396,7 +683,9 @@ class MovieRenamer:
 
         self.preview_list.delete(0, tk.END)
 
-        for filepath, new_name, tmdb_data, status in self.preview_data:
+        lines = []
+        self.line_to_movie_index = []
+        for movie_index, (filepath, new_name, tmdb_data, status) in enumerate(self.preview_data):
             # Apply status filter
             if filter_status == "Not Found" and status != "not_found":
                 continue
@@ -410,18 +699,26 @@ class MovieRenamer:
                         search_term in os.path.basename(filepath).lower()):
                     continue
 
-            self.display_preview_item(filepath, new_name, tmdb_data, status)
+            item_lines = self.preview_item_lines(filepath, new_name, tmdb_data)
+            lines.extend(item_lines)
+            self.line_to_movie_index.extend([movie_index] * len(item_lines))
 
-    def display_preview_item(self, filepath, new_name, tmdb_data, status="found"):
-        """Display a single preview item"""
+        # One Listbox insert for the whole list instead of one per line
+        if lines:
+            self.preview_list.insert(tk.END, *lines)
+
+    def preview_item_lines(self, filepath, new_name, tmdb_data):
+        """Build the listbox lines for a single preview item"""
         filename = os.path.basename(filepath)
         sanitized_folder = self.sanitize_filename(f"{tmdb_data['title']} ({tmdb_data['year']})")
 
-        self.preview_list.insert(tk.END, "=" * 80)
-        self.preview_list.insert(tk.END, f"OLD: {filename}")
-        self.preview_list.insert(tk.END, f"NEW: {new_name}")
-        self.preview_list.insert(tk.END, f"FOLDER: {sanitized_folder}/")
-        self.preview_list.insert(tk.END, "")
+        return (
+            _SEP_LINE,
+            f"OLD: {filename}",
+            f"NEW: {new_name}",
+            f"FOLDER: {sanitized_folder}/",
+            "",
+        )
 
     def show_settings(self):
         """Show settings dialog"""
@@ -468,6 +765,10 @@ class MovieRenamer:
         lang_combo = ttk.Combobox(scrollable_frame, textvariable=self.language, values=["en", "es", "fr", "de", "pt", "ja", "zh"])
         lang_combo.pack(padx=10, pady=5)
 
+        # Cache
+        tk.Label(scrollable_frame, text="TMDB Cache:", font=("Arial", 10, "bold"), bg=colors['bg'], fg=colors['fg']).pack(anchor="w", padx=10, pady=(15, 5))
+        tk.Checkbutton(scrollable_frame, text="Re-query movies previously not found", variable=self.requery_negatives, bg=colors['bg'], fg=colors['fg']).pack(anchor="w", padx=10, pady=2)
+
         # Buttons
         button_frame = tk.Frame(scrollable_frame, bg=colors['bg'])
         button_frame.pack(pady=20)
@@ -478,7 +779,8 @@ class MovieRenamer:
                 messagebox.showerror("Error", "API key cannot be empty")
                 return
 
-            self.save_settings()
+            self.update_session_params()
+            self.save_config()
             messagebox.showinfo("Saved", "Settings saved successfully")
             settings.destroy()
 
@@ -489,160 +791,175 @@ class MovieRenamer:
         selection = self.preview_list.curselection()
         if selection:
             index = selection[0]
-            movie_index = 0
-            line_count = 0
-            for i, item in enumerate(self.preview_data):
-                line_count += 5  # Simplified preview has 5 lines per item
-                if index < line_count:
-                    movie_index = i
-                    break
-
-            if movie_index < len(self.preview_data):
+            movie_index = self.line_to_movie_index[index] if index < len(self.line_to_movie_index) else None
+
+            if movie_index is not None:
                 self.show_tmdb_override(movie_index)
 
     def show_tmdb_override(self, movie_index):
         """Show TMDB override dialog"""
-        filepath, current_name, tmdb_result, _ = self.preview_data[movie_index]
-        filename = os.path.basename(filepath)
-        name, ext = os.path.splitext(filename)
-
-        # Extract year from parentheses first (highest priority)
-        year_match = re.search(r'\((\d{4})\)', name)
-        year = year_match.group(1) if year_match else None
-
-        # If no year in parentheses, look for standalone 4-digit year (1900-2100)
-        if not year:
-            year_match = re.search(r'(?:^|\D)([12]\d{3})(?:\D|$)', name)
-            if year_match:
-                year = year_match.group(1)
+        filepath = self.preview_data[movie_index][0]
+        name = os.path.splitext(os.path.basename(filepath))[0]
 
-        # Clean the name step by step
-        clean_name = re.sub(r'\(\d{4}\)', '', name).strip()  # Remove (YYYY)
-        clean_name = re.sub(r'[\[\{].*?[\]\}]', '', clean_name).strip()  # Remove [brackets] and {braces}
+        clean_name, year = parse_filename(name)
 
-        # Remove year numbers if not captured above (1900-2100)
-        clean_name = re.sub(r'\b[12]\d{3}\b', '', clean_name).strip()
-
-        # Remove common usernames/release groups (must be preceded by separator)
-        clean_name = re.sub(r'[\._-](rarbg|anoXmous|scene|proper|rerip|remux)(?:\.|_|-|$)', ' ', clean_name, flags=re.IGNORECASE).strip()
-
-        # Remove quality markers and common release tags
-        quality_markers = r'\b(1080p|720p|480p|2160p|4k|uhd|bluray|blu-ray|bdrip|webrip|hdtv|dvdrip|h\.?264|x\.?264|hevc|h\.?265|x\.?265|aac|ac3|dts|amd64|x86_64|10bit|avc|vc1|mpeg2|aiff|flac|opus|vorbis|mp3|eac3|truehd|dts-hd|atmos|imax|remastered|extended|directors?cut|uncut|proper|rerip|remux|pdtv|dsr|ts|tc|r5|dvdscr|brrip|xvid|divx|h264|x264|web|web-dl|web-rip)\b'
-        clean_name = re.sub(quality_markers, '', clean_name, flags=re.IGNORECASE).strip()
-
-        clean_name = re.sub(r'[._-]+', ' ', clean_name).strip()  # Convert dots/dashes/underscores to spaces
-        clean_name = ' '.join(clean_name.split())  # Collapse multiple spaces
+        # The lookup may wait on the rate limiter or retries, so keep it off the Tk main thread
+        thread = threading.Thread(target=self._override_lookup_thread, args=(movie_index, filepath, clean_name, year), daemon=True)
+        thread.start()
 
+    def _override_lookup_thread(self, movie_index, filepath, clean_name, year):
+        """Fetch override candidates in background thread, then open the dialog on the main thread"""
         try:
-            url = f"{self.tmdb_base}/search/movie"
-            params = {
-                'api_key': self.api_key,
-                'query': clean_name,
-                'page': 1,
-                'language': self.language.get()
-            }
-            if year:
-                params['year'] = year
-
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-
-            if not data['results']:
-                messagebox.showwarning("No Results", "No TMDB results found")
-                return
-
-            override_window = tk.Toplevel(self.root)
-            override_window.title(f"Select Correct Movie: {filename}")
-            override_window.geometry("600x400")
-
-            tk.Label(override_window, text="Double-click to select:").pack(anchor="w", padx=10, pady=5)
-
-            listbox = tk.Listbox(override_window)
-            listbox.pack(fill="both", expand=True, padx=10, pady=5)
-
-            results = []
-            for result in data['results'][:10]:
-                year_str = result['release_date'][:4] if result.get('release_date') else 'N/A'
-                rating = result.get('vote_average', 0)
-                text = f"{result['title']} ({year_str}) - Rating: {rating}/10"
-                listbox.insert("end", text)
-                results.append(result)
-
-            def on_select(event=None):
-                selection = listbox.curselection()
-                if selection:
-                    selected = results[selection[0]]
-                    new_result = {
-                        'title': selected['title'],
-                        'year': selected['release_date'][:4] if selected.get('release_date') else 'UNKNOWN',
-                        'id': selected['id'],
-                    }
-                    self.preview_data[movie_index] = (filepath, self.build_filename(new_result, ext), new_result, "found")
-                    override_window.destroy()
-                    self.apply_filters()
-
-            listbox.bind('<Double-Button-1>', on_select)
-            tk.Button(override_window, text="Select", command=on_select).pack(pady=10)
-
+            data = self._tmdb_search(clean_name, year)
         except Exception as e:
-            messagebox.showerror("Error", f"Error fetching TMDB results: {e}")
+            self.root.after(0, messagebox.showerror, "Error", f"Error fetching TMDB results: {e}")
+            return
 
-    def load_last_folder(self):
-        try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    folder = f.read().strip()
-                    if os.path.isdir(folder):
-                        return folder
-        except:
-            pass
-        return ""
+        self.root.after(0, self._open_override_dialog, movie_index, filepath, data)
 
-    def save_last_folder(self, folder):
-        try:
-            with open(self.config_file, 'w') as f:
-                f.write(folder)
-        except:
-            pass
+    def _open_override_dialog(self, movie_index, filepath, data):
+        """Let the user pick the correct TMDB match (runs on the Tk main thread)"""
+        # The preview may have been cleared or rescanned while the lookup was running
+        if movie_index >= len(self.preview_data) or self.preview_data[movie_index][0] != filepath:
+            return
+        current_status = self.preview_data[movie_index][3]
+        filename = os.path.basename(filepath)
+        ext = os.path.splitext(filename)[1]
 
-    def load_settings(self):
+        if not data:
+            messagebox.showwarning("No Results", "No TMDB results found")
+            return
+
+        override_window = tk.Toplevel(self.root)
+        override_window.title(f"Select Correct Movie: {filename}")
+        override_window.geometry("600x400")
+
+        tk.Label(override_window, text="Double-click to select:").pack(anchor="w", padx=10, pady=5)
+
+        listbox = tk.Listbox(override_window)
+        listbox.pack(fill="both", expand=True, padx=10, pady=5)
+
+        results = []
+        for result in data['results'][:10]:
+            year_str = result['release_date'][:4] if result.get('release_date') else 'N/A'
+            rating = result.get('vote_average', 0)
+            text = f"{result['title']} ({year_str}) - Rating: {rating}/10"
+            listbox.insert("end", text)
+            results.append(result)
+
+        def on_select(event=None):
+            selection = listbox.curselection()
+            if selection:
+                new_result = movie_from_result(results[selection[0]])
+                if current_status != "found":
+                    self.found_count += 1
+                self.preview_data[movie_index] = (filepath, self.build_filename(new_result, ext), new_result, "found")
+                self.preview_cache[(filepath, self.session.params['language'])] = new_result  # Keep the manual pick on rescan
+                override_window.destroy()
+                self.apply_filters()
+
+        listbox.bind('<Double-Button-1>', on_select)
+        tk.Button(override_window, text="Select", command=on_select).pack(pady=10)
+
+    def load_config(self):
+        """Load every saved setting with a single JSON read"""
+        config = {}
         try:
             if os.path.exists(self.settings_file):
                 with open(self.settings_file, 'r') as f:
-                    data = json.load(f)
-                    self.naming_pattern.set(data.get('naming_pattern', "{title} ({year})"))
-                    self.language.set(data.get('language', "en"))
+                    config = json.load(f)
         except:
             pass
+        if not isinstance(config, dict):
+            config = {}
+
+        if self.migrate_legacy_config(config):
+            try:
+                with open(self.settings_file, 'w') as f:
+                    json.dump(config, f)
+            except:
+                pass
+        return config
+
+    def migrate_legacy_config(self, config):
+        """Fold the old per-setting dotfiles into config and remove them"""
+        home = os.path.expanduser("~")
+        legacy_files = [
+            ('last_folder', ".movie_renamer_config"),
+            ('dark_mode', ".movie_renamer_theme"),
+            (None, ".movie_renamer_window"),  # Pickled window state, not read back
+        ]
 
-    def save_settings(self):
+        migrated = False
+        for key, name in legacy_files:
+            path = os.path.join(home, name)
+            if not os.path.exists(path):
+                continue
+            try:
+                if key:
+                    with open(path, 'r') as f:
+                        value = f.read().strip()
+                    if key == 'dark_mode':
+                        value = value == "dark"
+                    config.setdefault(key, value)
+                os.remove(path)
+                migrated = True
+                print(f"[DEBUG] Migrated legacy config file: {path}")
+            except:
+                pass
+        return migrated
+
+    def schedule_config_save(self):
+        """Write the config 500 ms after the last change"""
+        if self.config_save_job is not None:
+            self.root.after_cancel(self.config_save_job)
+        self.config_save_job = self.root.after(500, self.save_config)
+
+    def save_config(self):
+        """Write every setting to the JSON config file"""
+        if self.config_save_job is not None:
+            self.root.after_cancel(self.config_save_job)
+            self.config_save_job = None
+
+        self.config.update({
+            'naming_pattern': self.naming_pattern.get(),
+            'language': self.language.get(),
+            'requery_negatives': self.requery_negatives.get(),
+            'dark_mode': self.dark_mode.get(),
+            'last_folder': self.last_folder,
+            'window_state': self.window_state
+        })
         try:
-            data = {
-                'naming_pattern': self.naming_pattern.get(),
-                'language': self.language.get()
-            }
             with open(self.settings_file, 'w') as f:
-                json.dump(data, f)
+                json.dump(self.config, f)
         except:
             pass
 
+    def load_last_folder(self):
+        folder = self.config.get('last_folder', "")
+        if folder and os.path.isdir(folder):
+            return folder
+        return ""
+
+    def save_last_folder(self, folder):
+        self.last_folder = folder
+        self.schedule_config_save()
+
+    def load_settings(self):
+        config = self.config
+        self.dark_mode.set(config.get('dark_mode', True))
+        self.naming_pattern.set(config.get('naming_pattern', "{title} ({year})"))
+        self.language.set(config.get('language', "en"))
+        self.requery_negatives.set(config.get('requery_negatives', False))
+        self.window_state = config.get('window_state')
+
     def sanitize_filename(self, filename):
-        return re.sub(r'[<>:"/\\|?*]', '', filename).strip()
+        return filename.translate(_SANITIZE_TABLE).strip()
 
     def convert_roman_numerals(self, text):
         """Convert Roman numerals to Arabic numerals for better TMDB matching"""
-        roman_map = {
-            'IV': '4', 'IX': '9', 'XL': '40', 'XC': '90', 'CD': '400', 'CM': '900',
-            'I': '1', 'V': '5', 'X': '10', 'L': '50', 'C': '100', 'D': '500', 'M': '1000'
-        }
-
-        # Replace longer numerals first to avoid partial replacements
-        for roman, num in sorted(roman_map.items(), key=lambda x: len(x[0]), reverse=True):
-            # Match whole words only (surrounded by spaces or word boundaries)
-            text = re.sub(r'\b' + roman + r'\b', num, text, flags=re.IGNORECASE)
-
-        return text
+        # Single pass over whole words only (surrounded by spaces or word boundaries)
+        return _ROMAN_RE.sub(lambda m: _ROMAN_MAP[m.group(1).upper()], text)
 
     def build_filename(self, tmdb_data, ext):
         pattern = self.naming_pattern.get()
@@ -655,7 +972,7 @@ class MovieRenamer:
     def browse_files(self):
         files = filedialog.askopenfilenames(
             title="Select Movie Files",
-            filetypes=[("Video Files", "*.mp4 *.mkv *.avi *.mov *.flv")],
+            filetypes=[("Video Files", _VIDEO_FILETYPES)],
             initialdir=self.last_folder if self.last_folder else None
         )
         if files:
@@ -674,116 +991,165 @@ class MovieRenamer:
         if folder:
             self.save_last_folder(folder)
             self.last_folder = folder
-            files = []
-            video_extensions = ('mp4', 'mkv', 'avi', 'mov', 'flv')
-
-            for ext in video_extensions:
-                files.extend(Path(folder).glob(f"**/*.{ext}"))
-                files.extend(Path(folder).glob(f"**/*.{ext.upper()}"))
-
-            files = list(set(files))
+            self.process_files([], [folder])
 
-            if files:
-                self.process_files([str(f) for f in files])
-            else:
-                messagebox.showwarning("No Files", "No video files found in folder")
+    def process_files(self, files, folders=()):
+        """Process files, plus videos found under folders, in background thread"""
+        # The current preview stays until the worker knows there is something to replace it with
+        if folders:
+            self.status.set("Scanning folders for videos...")
 
-    def process_files(self, files):
-        """Process files in background thread"""
-        thread = threading.Thread(target=self._process_files_thread, args=(files,), daemon=True)
+        thread = threading.Thread(target=self._process_files_thread, args=(files, folders), daemon=True)
         thread.start()
 
-    def _process_files_thread(self, files):
+    def _process_files_thread(self, files, folders=()):
         """Background thread for file processing"""
-        self.status.set(f"Processing {len(files)} files...")
-        self.progress['value'] = 0
-        self.progress['maximum'] = len(files)
-        self.root.update()
+        if folders:
+            files = list(files)
+            for folder in folders:
+                files.extend(_iter_videos(folder))
+            files = list(dict.fromkeys(files))  # Remove duplicates, keep drop order
+            print(f"[DEBUG] Found {len(files)} video file(s) in {len(folders)} folder(s)")
+
+            if not files:
+                self.root.after(0, self.status.set, "Ready")
+                self.root.after(0, messagebox.showwarning, "No Files", "No video files found in folder")
+                return
 
-        self.preview_data = []
-        self.preview_list.delete(0, tk.END)
+        self.root.after(0, self._start_progress, len(files))
 
-        for idx, filepath in enumerate(files):
+        # Missing files are reported as-is; files matched in an earlier scan skip cleaning and TMDB entirely
+        lang = self.session.params['language']
+        lookups = []
+        for filepath in files:
             if not os.path.exists(filepath):
-                self.preview_list.insert(tk.END, f"✗ FILE NOT FOUND: {filepath}\n")
-                self.progress['value'] = idx + 1
-                self.root.update()
+                self._queue_preview((filepath, None, "missing"))
                 continue
+            tmdb_result = self.preview_cache.get((filepath, lang))
+            if tmdb_result is not None:
+                self._queue_preview((filepath, tmdb_result, "found"))
+            else:
+                lookups.append(filepath)
 
-            filename = os.path.basename(filepath)
-            name, ext = os.path.splitext(filename)
+        # Clean every name up front so the pool only ever waits on the network
+        items = list(self._prepare_items(lookups))
 
-            print(f"[DEBUG] Processing: {filename}")
-            print(f"[DEBUG] Name before cleaning: {name}")
+        with ThreadPoolExecutor(max_workers=LOOKUP_WORKERS) as executor:
+            futures = [executor.submit(self._lookup_one, *item) for item in items]
 
-            # Extract year from parentheses first (highest priority)
-            year_match = re.search(r'\((\d{4})\)', name)
-            year = year_match.group(1) if year_match else None
+            for future in as_completed(futures):
+                self._queue_preview(future.result())
 
-            # If no year in parentheses, look for standalone 4-digit year (1900-2100)
-            if not year and re.search(r'[._\s-]([12]\d{3})[._\s-]', name):
-                year_match = re.search(r'[._\s-]([12]\d{3})[._\s-]', name)
-                if year_match:
-                    year = year_match.group(1)
-                    print(f"[DEBUG] Found year in filename: {year}")
+        self.root.after(0, self._finish_processing)
 
-            # Clean the name step by step
-            clean_name = re.sub(r'\(\d{4}\)', '', name).strip()  # Remove (YYYY)
-            clean_name = re.sub(r'[\[\{].*?[\]\}]', '', clean_name).strip()  # Remove [brackets] and {braces}
+    def _queue_preview(self, entry):
+        """Buffer a result; the main thread picks them up in batches every 50 ms"""
+        with self.preview_lock:
+            self.preview_pending.append(entry)
+            schedule_flush = not self.preview_flush_scheduled
+            self.preview_flush_scheduled = True
+        if schedule_flush:
+            self.root.after(50, self._flush_preview)
 
-            # Remove year numbers if not captured above (1900-2100)
-            clean_name = re.sub(r'\b[12]\d{3}\b', '', clean_name).strip()
+    def _flush_preview(self):
+        """Show buffered lookup results and progress (runs on the Tk main thread)"""
+        with self.preview_lock:
+            pending, self.preview_pending = self.preview_pending, []
+            self.preview_flush_scheduled = False
 
-            # Remove common usernames/release groups
-            clean_name = re.sub(r'[\._-](rarbg|anoXmous|scene|proper|rerip|remux)(?:\.|_|-|$)', ' ', clean_name, flags=re.IGNORECASE).strip()
+        if not pending:
+            return
 
-            # Remove quality markers and common release tags
-            quality_markers = r'\b(1080p|720p|480p|2160p|4k|uhd|ultraHD|UltraHD|bluray|blu-ray|bdrip|webrip|hdtv|dvdrip|h\.?264|x\.?264|hevc|h\.?265|x\.?265|aac|ac3|dts|amd64|x86_64|10bit|avc|vc1|mpeg2|aiff|flac|opus|vorbis|mp3|eac3|truehd|dts-hd|atmos|imax|remastered|extended|directors?cut|uncut|proper|rerip|remux|pdtv|dsr|ts|tc|r5|dvdscr|brrip|xvid|divx|h264|x264|web|web-dl|web-rip)\b'
-            clean_name = re.sub(quality_markers, '', clean_name, flags=re.IGNORECASE).strip()
+        lines = []
+        for filepath, tmdb_result, status in pending:
+            lines.extend(self._append_preview(filepath, tmdb_result, status))
+        self.preview_list.insert(tk.END, *lines)
 
-            clean_name = re.sub(r'[._-]+', ' ', clean_name).strip()  # Convert dots/dashes/underscores to spaces
-            clean_name = ' '.join(clean_name.split())  # Collapse multiple spaces
+        done = int(self.progress['value']) + len(pending)
+        self._set_progress(done, int(self.progress['maximum']), os.path.basename(pending[-1][0]))
+
+    def _start_progress(self, total):
+        """Reset the preview and progress once there are files to show (runs on the Tk main thread)"""
+        self.preview_data = []
+        self.found_count = 0
+        self.line_to_movie_index = []
+        self.preview_list.delete(0, tk.END)
+
+        self.progress['value'] = 0
+        self.progress['maximum'] = total
+        self.status.set(f"Processing {total} files...")
+
+    def _set_progress(self, done, total, filename):
+        """Update progress bar and status text (runs on the Tk main thread)"""
+        self.progress['value'] = done
+        # Show progress with file count and current filename
+        progress_pct = int(done / total * 100) if total else 100
+        file_display = filename[:40] + "..." if len(filename) > 40 else filename
+        self.status.set(f"Progress: {done}/{total} ({progress_pct}%) - {file_display}")
+
+    def _prepare_items(self, files):
+        """Yield (filepath, clean_name, year) for each file - CPU work only, no network"""
+        for filepath in files:
+            name = os.path.splitext(os.path.basename(filepath))[0]
+
+            print(f"[DEBUG] Name before cleaning: {name}")
+
+            clean_name, year = parse_filename(name)
 
             print(f"[DEBUG] Name after cleaning: '{clean_name}' (year: {year})")
 
-            self.status.set(f"Searching TMDB: {clean_name}...")
-            self.root.update()
+            yield filepath, clean_name, year
 
-            tmdb_result = self.search_tmdb(clean_name, year)
+    def _lookup_one(self, filepath, clean_name, year):
+        """Search TMDB for one cleaned name (runs in worker thread)"""
+        print(f"[DEBUG] Processing: {os.path.basename(filepath)}")
 
-            if tmdb_result:
-                new_name = self.build_filename(tmdb_result, ext)
-                self.preview_data.append((filepath, new_name, tmdb_result, "found"))
-                self.display_preview_item(filepath, new_name, tmdb_result, "found")
-            else:
-                self.preview_data.append((filepath, filename, {'title': 'NOT FOUND', 'year': ''}, "not_found"))
-                self.preview_list.insert(tk.END, f"✗ NOT FOUND: {filename}\n")
+        tmdb_result = self.search_tmdb(clean_name, year)
+        return filepath, tmdb_result, "found" if tmdb_result else "not_found"
 
-            self.progress['value'] = idx + 1
-            # Show progress with file count and current filename
-            progress_pct = int((idx + 1) / len(files) * 100)
-            file_display = filename[:40] + "..." if len(filename) > 40 else filename
-            self.status.set(f"Progress: {idx + 1}/{len(files)} ({progress_pct}%) - {file_display}")
-            self.root.update()
-            self.root.update_idletasks()  # Force UI refresh
+    def _append_preview(self, filepath, tmdb_result, status):
+        """Record a lookup result, returning the lines to show (runs on the Tk main thread)"""
+        if status == "missing":
+            self.line_to_movie_index.append(None)
+            return (f"✗ FILE NOT FOUND: {filepath}\n",)
 
-        found_count = len([p for p in self.preview_data if p[3] == 'found'])
-        self.status.set(f"Ready - {found_count} movies found")
+        movie_index = len(self.preview_data)
+        filename = os.path.basename(filepath)
+        if status == "found":
+            self.preview_cache[(filepath, self.session.params['language'])] = tmdb_result
+            new_name = self.build_filename(tmdb_result, os.path.splitext(filename)[1])
+            self.preview_data.append((filepath, new_name, tmdb_result, "found"))
+            self.found_count += 1
+            lines = self.preview_item_lines(filepath, new_name, tmdb_result)
+        else:
+            self.preview_data.append((filepath, filename, {'title': 'NOT FOUND', 'year': ''}, "not_found"))
+            lines = (f"✗ NOT FOUND: {filename}\n",)
+
+        self.line_to_movie_index.extend([movie_index] * len(lines))
+        return lines
+
+    def _finish_processing(self):
+        """Show final status once every lookup has been added"""
+        self._flush_preview()
+        self.status.set(f"Ready - {self.found_count} movies found")
+
+        stats = self.cache_stats
+        lookups = sum(stats.values())
+        if lookups:
+            hit_ratio = (lookups - stats['network']) / lookups * 100
+            print(f"[DEBUG] TMDB cache: {stats} ({hit_ratio:.0f}% hit ratio)")
 
     def search_tmdb(self, query, year=None):
         """Search TMDB with caching and smart fallback"""
-        cache_key = f"{query}:{year}"
-
-        # Check cache first
-        if cache_key in self.tmdb_cache:
-            return self.tmdb_cache[cache_key]
+        # Nothing worth searching for - don't build or try any variants
+        stripped = query.strip().lower()
+        if not stripped or stripped == 'the':
+            return None
 
         try:
             if not self.api_key:
                 raise Exception("API key not configured")
 
-            url = f"{self.tmdb_base}/search/movie"
-
             # Try searches in order of specificity
             searches = []
 
@@ -795,10 +1161,12 @@ class MovieRenamer:
             searches.append((query, None))
 
             # 3. Try without Roman numeral conversion (might match better)
-            query_no_roman = re.sub(r'\b\d+\b', lambda m: self._number_to_roman(int(m.group())), query)
-            if query_no_roman != query:
-                searches.append((query_no_roman, year))
-                searches.append((query_no_roman, None))
+            # Most titles have no digits; one C-level translate pass skips the regex entirely
+            if query.translate(_DIGITS_DEL) != query:
+                query_no_roman = _INT_RE.sub(lambda m: _number_to_roman(int(m.group())), query)
+                if query_no_roman != query:
+                    searches.append((query_no_roman, year))
+                    searches.append((query_no_roman, None))
 
             # 4. Try first two words
             words = query.split()
@@ -809,90 +1177,50 @@ class MovieRenamer:
 
             # Execute searches
             for search_query, search_year in searches:
-                if not search_query or search_query.lower() == 'the':
-                    continue
-
                 print(f"[DEBUG] Searching TMDB: '{search_query}' (year: {search_year})")
 
-                params = {
-                    'api_key': self.api_key,
-                    'query': search_query,
-                    'page': 1,
-                    'language': self.language.get()
-                }
-                if search_year:
-                    params['year'] = search_year
-
-                response = requests.get(url, params=params, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-
-                if data['results']:
-                    result = data['results'][0]
-                    movie_id = result['id']
-
-                    tmdb_result = {
-                        'title': result['title'],
-                        'year': result['release_date'][:4] if result.get('release_date') else 'UNKNOWN',
-                        'id': movie_id,
-                    }
-
-                    # Cache result
-                    self.tmdb_cache[cache_key] = tmdb_result
+                data = self._tmdb_search(search_query, search_year)
+
+                if data:
+                    tmdb_result = movie_from_result(data['results'][0])
+
                     print(f"[DEBUG] Found: {tmdb_result['title']} ({tmdb_result['year']})")
                     return tmdb_result
 
             print(f"[DEBUG] No TMDB results found for any variation of: {query}")
 
         except requests.exceptions.Timeout:
-            messagebox.showerror("Timeout", "TMDB API request timed out. Check your internet connection.")
+            self.root.after(0, messagebox.showerror, "Timeout", "TMDB API request timed out. Check your internet connection.")
         except requests.exceptions.ConnectionError:
-            messagebox.showerror("Connection Error", "Could not connect to TMDB. Check your internet connection.")
+            self.root.after(0, messagebox.showerror, "Connection Error", "Could not connect to TMDB. Check your internet connection.")
         except Exception as e:
             print(f"[DEBUG] Error searching TMDB for '{query}': {e}")
 
         return None
 
-    def _number_to_roman(self, num):
-        """Convert number to Roman numeral"""
-        val = [1000, 900, 500, 400, 100, 90, 50, 40, 10, 9, 5, 4, 1]
-        syms = ['M', 'CM', 'D', 'CD', 'C', 'XC', 'L', 'XL', 'X', 'IX', 'V', 'IV', 'I']
-        roman_num = ''
-        i = 0
-        while num > 0:
-            for _ in range(num // val[i]):
-                roman_num += syms[i]
-                num -= val[i]
-            i += 1
-        return roman_num
-
     def apply(self):
         if not self.preview_data:
             messagebox.showwarning("Warning", "No files to process")
             return
 
-        if messagebox.askyesno("Confirm", f"Process {len([p for p in self.preview_data if p[3] == 'found'])} movies?"):
-            thread = threading.Thread(target=self._process_movies, daemon=True)
+        if messagebox.askyesno("Confirm", f"Process {self.found_count} movies?"):
+            processable = [p for p in self.preview_data if p[3] == 'found']
+            self.progress['maximum'] = len(processable)
+            self.progress['value'] = 0
+            self.status.set(f"Starting to process {len(processable)} movies...")
+
+            thread = threading.Thread(target=self._process_movies, args=(processable,), daemon=True)
             thread.start()
 
-    def _process_movies(self):
+    def _process_movies(self, processable):
         self.processing = True
         success = 0
         failed = []
 
-        processable = [p for p in self.preview_data if p[3] == 'found']
-        self.progress['maximum'] = len(processable)
-        self.progress['value'] = 0
-
-        self.status.set(f"Starting to process {len(processable)} movies...")
-        self.root.update()
-
         for i, (filepath, new_name, tmdb_data, status) in enumerate(processable):
             try:
-                file_dir = os.path.dirname(filepath)  # The folder containing the file
-                parent_dir = os.path.dirname(file_dir)  # Parent of that folder
-                old_folder_name = os.path.basename(file_dir)  # Current folder name
-                old_filename = os.path.basename(filepath)  # Current file name
+                file_dir, old_filename = os.path.split(filepath)  # The folder containing the file, current file name
+                parent_dir, old_folder_name = os.path.split(file_dir)  # Parent of that folder, current folder name
 
                 # Build new folder and file names
                 movie_folder_name = f"{tmdb_data['title']} ({tmdb_data['year']})"
@@ -901,10 +1229,12 @@ class MovieRenamer:
                 new_filepath = os.path.join(new_folder, new_name)
 
                 # Step 1: Rename the parent folder if different
+                folder_existed = False
                 if file_dir != new_folder:
-                    if not os.path.exists(new_folder):
-                        self.status.set(f"Renaming folder: {old_folder_name} → {movie_folder_name}...")
-                        self.root.update()
+                    if os.path.exists(new_folder):
+                        folder_existed = True  # Left alone, so the file may not be in it
+                    else:
+                        self._post_status(f"Renaming folder: {old_folder_name} → {movie_folder_name}...")
 
                         try:
                             os.rename(file_dir, new_folder)
@@ -913,41 +1243,30 @@ class MovieRenamer:
                             print(f"[DEBUG] Error renaming folder: {rename_error}")
                             raise
 
-                # Step 2: Rename the file inside the folder if different
-                if os.path.exists(new_folder):
-                    current_filepath = os.path.join(new_folder, old_filename)
+                # Step 2: Rename the file inside the folder if different (os.rename raises if it vanished)
+                current_filepath = os.path.join(new_folder, old_filename)
 
-                    if os.path.exists(current_filepath) and current_filepath != new_filepath:
-                        self.status.set(f"Renaming file: {old_filename} → {new_name}...")
-                        self.root.update()
+                if current_filepath != new_filepath and (not folder_existed or os.path.exists(current_filepath)):
+                    self._post_status(f"Renaming file: {old_filename} → {new_name}...")
 
+                    try:
+                        os.rename(current_filepath, new_filepath)
+                        print(f"[DEBUG] File renamed successfully: {old_filename} → {new_name}")
+                    except PermissionError:
+                        # Usually a transient lock (virus scanner, thumbnailer) - wait a moment and retry once
+                        time.sleep(0.1)
                         try:
                             os.rename(current_filepath, new_filepath)
-                            print(f"[DEBUG] File renamed successfully: {old_filename} → {new_name}")
-                        except PermissionError:
-                            # Try copy instead if rename fails
-                            try:
-                                import shutil
-                                shutil.copy2(current_filepath, new_filepath)
-                                os.remove(current_filepath)
-                                print(f"[DEBUG] File copied and deleted instead of renamed")
-                            except Exception as copy_error:
-                                print(f"[DEBUG] Copy also failed: {copy_error}")
-                                raise PermissionError(f"Cannot rename or copy file: {copy_error}")
-                        except Exception as rename_error:
-                            print(f"[DEBUG] Error renaming file: {rename_error}")
-                            raise
+                            print(f"[DEBUG] File renamed on retry: {old_filename} → {new_name}")
+                        except Exception as retry_error:
+                            print(f"[DEBUG] Retry also failed: {retry_error}")
+                            raise PermissionError(f"Cannot rename file: {retry_error}")
+                    except Exception as rename_error:
+                        print(f"[DEBUG] Error renaming file: {rename_error}")
+                        raise
 
                 success += 1
 
-                # Update progress with percentage and current movie
-                self.progress['value'] = i + 1
-                progress_pct = int((i + 1) / len(processable) * 100)
-                movie_display = new_name[:40] + "..." if len(new_name) > 40 else new_name
-                self.status.set(f"Processing: {success}/{len(processable)} ({progress_pct}%) - {movie_display}")
-                self.root.update()
-                self.root.update_idletasks()  # Force UI refresh
-
             except PermissionError:
                 failed.append((new_name, "Permission denied - check file permissions"))
             except OSError as e:
@@ -955,12 +1274,36 @@ class MovieRenamer:
             except Exception as e:
                 failed.append((new_name, str(e)))
 
+            # Update progress with percentage and current movie (always show the last one)
+            progress_pct = int((i + 1) / len(processable) * 100)
+            movie_display = new_name[:40] + "..." if len(new_name) > 40 else new_name
+            self._post_status(f"Processing: {success}/{len(processable)} ({progress_pct}%) - {movie_display}",
+                              done=i + 1, force=i + 1 == len(processable))
+
         msg = f"Processed {success}/{len(processable)} movies"
 
         if failed:
             msg += f"\n\nFailed ({len(failed)}):\n"
             msg += "\n".join([f"{name}: {err}" for name, err in failed[:5]])
 
+        self.root.after(0, self._finish_renaming, msg)
+
+    def _post_status(self, message, done=None, force=False):
+        """Schedule a status/progress update from a worker thread, at most ~10 per second"""
+        now = time.monotonic()
+        if not force and now - self.last_ui_update < 0.1:
+            return
+        self.last_ui_update = now
+        self.root.after(0, self._show_status, message, done)
+
+    def _show_status(self, message, done=None):
+        """Apply a posted status update (runs on the Tk main thread)"""
+        if done is not None:
+            self.progress['value'] = done
+        self.status.set(message)
+
+    def _finish_renaming(self, msg):
+        """Report rename results (runs on the Tk main thread)"""
         messagebox.showinfo("Processing Complete", msg)
         self.processing = False
         self.clear()
@@ -968,6 +1311,9 @@ class MovieRenamer:
     def clear(self):
         self.preview_list.delete(0, tk.END)
         self.preview_data = []
+        self.found_count = 0
+        self.line_to_movie_index = []
+        self.preview_cache = {}
         self.progress['value'] = 0
         self.search_var.set("")
         self.filter_var.set("All")
@@ -976,6 +1322,9 @@ class MovieRenamer:
     def on_closing(self):
         """Handle window closing"""
         self.save_window_state()
+        self.session.close()
+        if self.cache_db is not None:
+            self.cache_db.close()
         self.root.destroy()
 
 if __name__ == "__main__":